@@ -1,6 +1,4 @@
 import streamlit as st
-from ui.official_dashboard import show_official_dashboard
-from ui.resident_dashboard import show_resident_dashboard
 
 st.set_page_config(page_title="Solar Panel Verifier", layout="wide")
 
@@ -13,9 +11,12 @@ st.markdown("<hr>", unsafe_allow_html=True)
 
 role = st.selectbox("Select your role", ["Choose...", "Official", "Resident"])
 
+# Dashboards are imported on first use so the landing page renders without them
 if role == "Official":
+    from ui.official_dashboard import show_official_dashboard
     show_official_dashboard()
 
 elif role == "Resident":
+    from ui.resident_dashboard import show_resident_dashboard
     show_resident_dashboard()
 
@@ -0,0 +1,52 @@
+# src/adaptive_infer.py
+# Content-adaptive YOLO inference:
+#   1. tiles with almost no edges (water, open field, haze) exit early
+#   2. everything else gets a cheap reduced-resolution pass
+#   3. the tile escalates to a full-resolution pass only when that pass is
+#      inconclusive: nothing found, only weak boxes, or small confident boxes
+import cv2
+import numpy as np
+
+LOW_IMGSZ = 320
+FULL_IMGSZ = 640
+CONF = 0.1
+CONFIDENT_CONF = 0.25       # top box at or above this settles the tile (detect_yolo's threshold)
+SMALL_BOX_FRAC = 0.002      # box area / image area considered small
+EMPTY_EDGE_DENSITY = 0.01   # fraction of edge pixels below which a tile is empty
+EMPTY_GRAY_STD = 8.0
+
+def is_clearly_empty(img, edge_density=EMPTY_EDGE_DENSITY, gray_std=EMPTY_GRAY_STD):
+    # Panels are high-contrast grids; featureless tiles have neither edges nor texture
+    small = cv2.resize(img, (160, 160), interpolation=cv2.INTER_AREA)
+    gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    edges = cv2.Canny(gray, 50, 150)
+    density = np.count_nonzero(edges) / edges.size
+    return density < edge_density or float(gray.std()) < gray_std
+
+def needs_full_resolution(result, img_shape, confident_conf=CONFIDENT_CONF, small_frac=SMALL_BOX_FRAC):
+    boxes = result.boxes
+    # The tile has content but nothing resolved at low resolution: small
+    # panels may simply be too few pixels, so look again
+    if not boxes:
+        return True
+    # Only boxes in the ambiguous band [CONF, confident_conf)
+    confident = boxes.conf >= confident_conf
+    if not bool(confident.any()):
+        return True
+    # Confident but small boxes need full resolution for a usable area
+    xyxy = boxes.xyxy[confident]
+    areas = (xyxy[:, 2] - xyxy[:, 0]) * (xyxy[:, 3] - xyxy[:, 1])
+    return float(areas.min()) < small_frac * img_shape[0] * img_shape[1]
+
+def adaptive_predict(model, img, conf=CONF, low_imgsz=LOW_IMGSZ, full_imgsz=FULL_IMGSZ,
+                     confident_conf=CONFIDENT_CONF, small_frac=SMALL_BOX_FRAC):
+    # Returns (result or None, stage) where stage is "empty", "low" or "full"
+    if is_clearly_empty(img):
+        return None, "empty"
+
+    result = model(img, conf=conf, imgsz=low_imgsz, verbose=False)[0]
+    if not needs_full_resolution(result, img.shape, confident_conf, small_frac):
+        return result, "low"
+
+    result = model(img, conf=conf, imgsz=full_imgsz, verbose=False)[0]
+    return result, "full"
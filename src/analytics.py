@@ -0,0 +1,141 @@
+# src/analytics.py
+# District-level rollups over every manifest the pipeline has produced.
+# Per-sample figures live in samples.csv and only new or changed manifests
+# are parsed on update; their rows are folded into rollups.csv, the
+# (region, qc_status, date) cube the official dashboard reads.
+import json
+import os
+import re
+
+MANIFEST_DIR = "outputs/manifests"
+SAMPLES_PATH = "outputs/metrics/samples.csv"
+ROLLUP_PATH = "outputs/metrics/rollups.csv"
+
+# Same assumptions as the resident savings calculator
+SQM_PER_KW = 10             # ~10 sqm of panels per kW
+GENERATION_PER_KW = 120     # kWh/month per kW system
+COST_PER_KWH = 8            # ₹ per kWh
+CO2_PER_KWH = 0.82          # kg CO₂ avoided per kWh
+
+KEYS = ["region", "qc_status", "date"]
+MEASURES = ["pv_area_sqm", "system_kw", "generation_kwh_month", "savings_inr_month", "co2_tons_month"]
+
+def region_of(sample_id):
+    # BLR_002 -> BLR, VHN-001 -> VHN
+    return re.split(r"[_\-]", str(sample_id), maxsplit=1)[0].upper()
+
+def _read_manifest(path):
+    with open(path) as f:
+        m = json.load(f)
+    return {
+        "sample_id": str(m["sample_id"]),
+        "region": region_of(m["sample_id"]),
+        "qc_status": m.get("qc_status", "UNKNOWN"),
+        "date": m.get("image_metadata", {}).get("capture_date") or m.get("timestamp", "")[:10],
+        "has_solar": bool(m.get("has_solar")),
+        "pv_area_sqm": float(m.get("pv_area_sqm_est") or 0.0),
+        "lat": m.get("lat"),
+        "lon": m.get("lon"),
+        "mtime_ns": os.stat(path).st_mtime_ns,
+    }
+
+def _add_measures(df):
+    # Vectorized over the whole frame
+    df["system_kw"] = df["pv_area_sqm"] / SQM_PER_KW
+    df["generation_kwh_month"] = df["system_kw"] * GENERATION_PER_KW
+    df["savings_inr_month"] = df["generation_kwh_month"] * COST_PER_KWH
+    df["co2_tons_month"] = df["generation_kwh_month"] * CO2_PER_KWH / 1000
+    return df
+
+def load_samples(samples_path=SAMPLES_PATH):
+    import pandas as pd
+
+    if os.path.exists(samples_path):
+        return pd.read_csv(samples_path, dtype={"sample_id": str, "date": str})
+    return pd.DataFrame(columns=["sample_id", "region", "qc_status", "date", "has_solar",
+                                 "pv_area_sqm", "lat", "lon", "mtime_ns", *MEASURES[1:]])
+
+def update_samples(manifest_dir=MANIFEST_DIR, samples_path=SAMPLES_PATH):
+    # Upsert manifests that are new or modified since the last update.
+    # Returns (all samples, rows added, rows they replaced).
+    import pandas as pd
+
+    samples = load_samples(samples_path)
+    seen = dict(zip(samples["sample_id"], samples["mtime_ns"]))
+
+    fresh = []
+    if os.path.exists(manifest_dir):
+        for entry in os.scandir(manifest_dir):
+            if not entry.name.endswith(".json"):
+                continue
+            sample_id = os.path.splitext(entry.name)[0]
+            if seen.get(sample_id) == entry.stat().st_mtime_ns:
+                continue
+            try:
+                fresh.append(_read_manifest(entry.path))
+            except (OSError, ValueError, KeyError) as e:
+                print(f"[WARNING] Skipping manifest {entry.name}: {e}")
+
+    if not fresh:
+        return samples, samples.iloc[0:0], samples.iloc[0:0]
+
+    new = _add_measures(pd.DataFrame(fresh))
+    replaced_mask = samples["sample_id"].isin(new["sample_id"])
+    replaced = samples[replaced_mask]
+    os.makedirs(os.path.dirname(samples_path), exist_ok=True)
+    if os.path.exists(samples_path) and replaced.empty:
+        # Only new samples: append instead of rewriting the table
+        new = new[list(samples.columns)]
+        new.to_csv(samples_path, mode="a", header=False, index=False)
+        samples = pd.concat([samples, new], ignore_index=True)
+    else:
+        kept = samples[~replaced_mask]
+        samples = pd.concat([kept, new], ignore_index=True) if not kept.empty else new
+        samples.to_csv(samples_path, index=False)
+    return samples, new, replaced
+
+def build_rollups(samples):
+    grouped = samples.groupby(KEYS, dropna=False)
+    rollups = grouped[MEASURES].sum()
+    rollups["samples"] = grouped.size()
+    rollups["with_solar"] = grouped["has_solar"].sum()
+    return rollups.reset_index()
+
+def fold_rollups(rollups, added, removed):
+    # Add the new samples' cube to the existing one and subtract the
+    # contribution of the manifest versions they replaced
+    import pandas as pd
+
+    cols = MEASURES + ["samples", "with_solar"]
+    parts = [rollups, build_rollups(added)]
+    if not removed.empty:
+        old = build_rollups(removed)
+        old[cols] = -old[cols]
+        parts.append(old)
+    merged = pd.concat(parts, ignore_index=True).groupby(KEYS, dropna=False)[cols].sum().reset_index()
+    return merged[merged["samples"] > 0]
+
+def update_rollups(manifest_dir=MANIFEST_DIR, samples_path=SAMPLES_PATH, rollup_path=ROLLUP_PATH):
+    import pandas as pd
+
+    samples, added, removed = update_samples(manifest_dir, samples_path)
+    if os.path.exists(rollup_path):
+        rollups = pd.read_csv(rollup_path, dtype={"date": str})
+        if added.empty:
+            return rollups
+        rollups = fold_rollups(rollups, added, removed)
+    else:
+        rollups = build_rollups(samples)
+
+    os.makedirs(os.path.dirname(rollup_path), exist_ok=True)
+    rollups.to_csv(rollup_path, index=False)
+    return rollups
+
+def summarize(rollups, by):
+    # Re-aggregate the cube along one or more of KEYS
+    cols = MEASURES + ["samples", "with_solar"]
+    return rollups.groupby(by, dropna=False)[cols].sum().reset_index()
+
+if __name__ == "__main__":
+    r = update_rollups()
+    print(summarize(r, "region").to_string(index=False))
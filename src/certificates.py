@@ -0,0 +1,171 @@
+# src/certificates.py
+import csv
+import io
+import json
+import os
+import re
+import threading
+import zipfile
+from datetime import datetime
+
+TEMPLATE_PATH = "certificates/cert_temp.txt"
+CERT_DIR = "certificates"
+MANIFEST_DIR = "outputs/manifests"
+METRICS_PATH = "outputs/metrics/pipeline_metrics.csv"
+
+MIME_TYPES = {"txt": "text/plain", "pdf": "application/pdf"}
+
+# Sample IDs as the pipeline writes them; anything else never reaches a path
+SAMPLE_ID_RE = re.compile(r"[A-Za-z0-9_\-]+")
+
+_template_cache = {}
+_lock = threading.Lock()
+
+def is_eligible_for_certificate(qc_flag, solar_health_score):
+    return qc_flag and solar_health_score in ["High", "Medium"]
+
+def load_template(path=TEMPLATE_PATH):
+    # Read the template once; reload only if the file is edited
+    if not os.path.exists(path):
+        print(f"[WARNING] Certificate template not found at {path}")
+        return None
+    mtime = os.stat(path).st_mtime_ns
+    with _lock:
+        cached = _template_cache.get(path)
+        if cached is None or cached[0] != mtime:
+            with open(path, encoding="utf-8") as f:
+                cached = (mtime, f.read().format_map)
+            _template_cache[path] = cached
+    return cached[1]
+
+def pdf_available():
+    try:
+        import fpdf  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def _record_from_row(row):
+    sample_id = str(row["sample_id"])
+    if not is_eligible_for_certificate(row["qc_flag"] == "Pass", row["solar_health_score"]):
+        return None
+    return {
+        "sample_id": sample_id,
+        "panel_count": int(row["panel_count"]),
+        "total_area": round(float(row["total_area"]), 2),
+        "qc_flag": row["qc_flag"],
+        "solar_health_score": row["solar_health_score"],
+        "date": datetime.now().strftime("%Y-%m-%d"),
+    }
+
+def _add_capture_date(record, manifest_dir=MANIFEST_DIR):
+    manifest_path = os.path.join(manifest_dir, f"{record['sample_id']}.json")
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        capture_date = manifest.get("image_metadata", {}).get("capture_date")
+        if capture_date:
+            record["date"] = capture_date
+    return record
+
+def load_records(metrics_path=METRICS_PATH, manifest_dir=MANIFEST_DIR):
+    # Certificate fields for every eligible sample, joined from the metrics CSV and manifests
+    records = {}
+    if not os.path.exists(metrics_path):
+        return records
+
+    with open(metrics_path, newline="") as f:
+        for row in csv.DictReader(f):
+            record = _record_from_row(row)
+            if record is not None:
+                records[record["sample_id"]] = _add_capture_date(record, manifest_dir)
+    return records
+
+def load_record(sample_id, metrics_path=METRICS_PATH, manifest_dir=MANIFEST_DIR):
+    # A single sample's certificate fields: stops at its CSV row and reads only its manifest
+    sample_id = str(sample_id)
+    if not os.path.exists(metrics_path):
+        return None
+
+    with open(metrics_path, newline="") as f:
+        for row in csv.DictReader(f):
+            if str(row["sample_id"]) == sample_id:
+                record = _record_from_row(row)
+                return _add_capture_date(record, manifest_dir) if record is not None else None
+    return None
+
+def render_text(records, template_path=TEMPLATE_PATH):
+    render = load_template(template_path)
+    if render is None:
+        return {}
+    return {record["sample_id"]: render(record) for record in records}
+
+def _text_to_pdf(text):
+    from fpdf import FPDF
+
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Courier", size=10)
+    for line in text.splitlines():
+        pdf.cell(0, 5, line.encode("latin-1", "replace").decode("latin-1"), new_x="LMARGIN", new_y="NEXT")
+    return bytes(pdf.output())
+
+def render_batch(records, fmt="txt", template_path=TEMPLATE_PATH):
+    # Render many certificates with a single template load; returns {sample_id: bytes}
+    texts = render_text(list(records), template_path)
+    if fmt == "pdf":
+        return {sample_id: _text_to_pdf(text) for sample_id, text in texts.items()}
+    return {sample_id: text.encode("utf-8") for sample_id, text in texts.items()}
+
+def certificate_path(sample_id, fmt="txt", cert_dir=CERT_DIR):
+    return os.path.join(cert_dir, f"{sample_id}_certificate.{fmt}")
+
+def get_certificate(sample_id, fmt="txt", records=None, cert_dir=CERT_DIR, template_path=TEMPLATE_PATH):
+    # Render on first request and keep the file for later downloads; a file
+    # older than the template is stale and rendered again.
+    # sample_id may be free text, so it must look like a sample ID before any path is built.
+    sample_id = str(sample_id)
+    if fmt not in MIME_TYPES or not SAMPLE_ID_RE.fullmatch(sample_id):
+        return None
+    if not os.path.exists(template_path):
+        return None
+
+    path = certificate_path(sample_id, fmt, cert_dir)
+    if os.path.exists(path) and os.stat(path).st_mtime_ns >= os.stat(template_path).st_mtime_ns:
+        with open(path, "rb") as f:
+            return f.read()
+
+    record = records.get(sample_id) if records is not None else load_record(sample_id)
+    if record is None:
+        return None
+
+    data = render_batch([record], fmt, template_path).get(sample_id)
+    if data is None:
+        return None
+    os.makedirs(cert_dir, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    return data
+
+def export_zip(sample_ids=None, fmt="txt", records=None):
+    # Bundle certificates into one in-memory ZIP archive
+    if records is None:
+        records = load_records()
+    if sample_ids is not None:
+        wanted = {str(s) for s in sample_ids}
+        records = {k: v for k, v in records.items() if k in wanted}
+
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        for sample_id, data in render_batch(records.values(), fmt).items():
+            zf.writestr(f"{sample_id}_certificate.{fmt}", data)
+    return buf.getvalue()
+
+def clear_generated(cert_dir=CERT_DIR):
+    # Remove rendered certificates, keeping the template
+    if not os.path.exists(cert_dir):
+        os.makedirs(cert_dir, exist_ok=True)
+        return
+    for file in os.listdir(cert_dir):
+        if file.endswith(("_certificate.txt", "_certificate.pdf")):
+            os.remove(os.path.join(cert_dir, file))
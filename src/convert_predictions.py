@@ -1,16 +1,18 @@
 import os
+import sys
 import json
 
-# Load raw predictions
-with open("outputs/predictions/predictions.json") as f:
-    raw_data = json.load(f)
+from predictions_io import PRED_PATH, iter_predictions
+
+# --follow: start while detect_yolo.py is still writing
+FOLLOW = "--follow" in sys.argv
 
 # Create output folder
 output_dir = "outputs/train_predictions"
 os.makedirs(output_dir, exist_ok=True)
 
-# Process each image's predictions
-for item in raw_data:
+# Process each image's predictions as they are read
+for item in iter_predictions(PRED_PATH, follow=FOLLOW):
     image_name = item["image"]
     sample_id = os.path.splitext(image_name)[0]
     boxes = item["boxes"]
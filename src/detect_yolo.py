@@ -1,24 +1,29 @@
-from ultralytics import YOLO
-import os, glob, json
+import os, glob
 
-# Load YOLO model (pretrained)
-model = YOLO("yolov8s.pt")  # downloads automatically
+from predictions_io import PRED_PATH, PredictionWriter
 
 # Pick your test images
 IMAGE_DIR = "data/test"
-OUT_DIR = "outputs/predictions"
-os.makedirs(OUT_DIR, exist_ok=True)
+BATCH_SIZE = 16
 
-results = []
-for img_path in glob.glob(os.path.join(IMAGE_DIR, "*.*")):
-    r = model.predict(img_path, conf=0.25, iou=0.45, verbose=False)[0]
-    boxes = []
-    for i in range(len(r.boxes)):
-        xyxy = r.boxes.xyxy[i].tolist()   # box coordinates
-        conf = float(r.boxes.conf[i].item())  # confidence
-        boxes.append({"xyxy": xyxy, "conf": conf})
-    results.append({"image": os.path.basename(img_path), "boxes": boxes})
+image_paths = sorted(glob.glob(os.path.join(IMAGE_DIR, "*.*")))
 
-# Save predictions
-with open(os.path.join(OUT_DIR, "predictions.json"), "w") as f:
-    json.dump(results, f, indent=2)
\ No newline at end of file
+# Stream predictions to JSON Lines, flushing after every batch. The run is
+# announced before the model loads so --follow readers wait for it.
+with PredictionWriter(PRED_PATH) as writer:
+    from ultralytics import YOLO
+
+    # Load YOLO model (pretrained)
+    model = YOLO("yolov8s.pt")  # downloads automatically
+
+    for start in range(0, len(image_paths), BATCH_SIZE):
+        batch = image_paths[start:start + BATCH_SIZE]
+        records = []
+        for img_path, r in zip(batch, model.predict(batch, conf=0.25, iou=0.45, verbose=False, stream=True)):
+            boxes = []
+            for i in range(len(r.boxes)):
+                xyxy = r.boxes.xyxy[i].tolist()   # box coordinates
+                conf = float(r.boxes.conf[i].item())  # confidence
+                boxes.append({"xyxy": xyxy, "conf": conf})
+            records.append({"image": os.path.basename(img_path), "boxes": boxes})
+        writer.write_batch(records)
@@ -0,0 +1,94 @@
+# src/eval_adaptive.py
+# Quality/throughput of adaptive inference vs the fixed-resolution baseline
+# on the labeled test split (solar_present per image).
+import argparse
+import functools
+import os
+import time
+
+import cv2
+import numpy as np
+import pandas as pd
+
+from adaptive_infer import CONFIDENT_CONF, FULL_IMGSZ, LOW_IMGSZ, adaptive_predict
+from model_registry import MODEL_PATH, get_model
+from utils import accuracy, f1_binary
+
+TEST_CSV = "data/test_split.csv"
+PROCESSED_ROOT = "data/processed"
+
+# --calibrate grid: first-pass size x confidence that settles a tile
+CALIBRATION_GRID = [(imgsz, conf) for imgsz in (256, 320, 416) for conf in (0.2, 0.25, 0.3, 0.4)]
+
+def fixed_predict(model, img):
+    return model(img, conf=0.1, imgsz=FULL_IMGSZ, verbose=False)[0], "full"
+
+def run(model, images, predict):
+    preds, areas, stages = [], [], []
+    start = time.perf_counter()
+    for img in images:
+        result, stage = predict(model, img)
+        boxes = result.boxes if result is not None else None
+        if boxes:
+            xyxy = boxes.xyxy
+            area = float(((xyxy[:, 2] - xyxy[:, 0]) * (xyxy[:, 3] - xyxy[:, 1])).sum())
+        else:
+            area = 0.0
+        preds.append(1 if boxes else 0)
+        areas.append(area)
+        stages.append(stage)
+    elapsed = time.perf_counter() - start
+    return np.array(preds), np.array(areas), stages, elapsed
+
+def report(name, preds, labels, elapsed, fixed_time, stages=None):
+    n = len(preds)
+    line = (f"{name:22s} | acc={accuracy(preds, labels):.4f} | f1={f1_binary(preds, labels):.4f} "
+            f"| {n / elapsed:.1f} img/s | {fixed_time / elapsed:.2f}x")
+    if stages is not None:
+        line += (f" | empty={stages.count('empty') / n:.0%} low={stages.count('low') / n:.0%} "
+                 f"full={stages.count('full') / n:.0%}")
+    print(line)
+
+def stage_breakdown(preds, labels, stages):
+    # Labelled positives per stage and the recall on them. Positives in
+    # "empty" were never seen by YOLO, so they are lost to the early exit.
+    stages = np.array(stages)
+    for stage in ("empty", "low", "full"):
+        in_stage = stages == stage
+        positives = int(labels[in_stage].sum())
+        found = int(preds[in_stage & (labels == 1)].sum())
+        recall = f"{found / positives:.1%}" if positives else "n/a"
+        print(f"{'':22s} | {stage:5s}: {int(in_stage.sum())} tiles, {positives} positive, recall={recall}")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calibrate", action="store_true", help="sweep first-pass size and confidence band")
+    args = parser.parse_args()
+
+    df = pd.read_csv(TEST_CSV)
+    labels = df["solar_present"].astype(int).to_numpy()
+    images = [
+        cv2.imread(os.path.join(PROCESSED_ROOT, row["dataset_name"], "images", row["filename"]))
+        for _, row in df.iterrows()
+    ]
+
+    model = get_model(MODEL_PATH)
+    model(images[0], verbose=False)  # warm-up so neither mode pays the first-call cost
+
+    fixed_preds, fixed_areas, _, fixed_time = run(model, images, fixed_predict)
+    report("fixed", fixed_preds, labels, fixed_time, fixed_time)
+
+    grid = CALIBRATION_GRID if args.calibrate else [(LOW_IMGSZ, CONFIDENT_CONF)]
+    for low_imgsz, confident_conf in grid:
+        predict = functools.partial(adaptive_predict, low_imgsz=low_imgsz, confident_conf=confident_conf)
+        adapt_preds, adapt_areas, stages, adapt_time = run(model, images, predict)
+        report(f"adaptive {low_imgsz}px/{confident_conf}", adapt_preds, labels, adapt_time, fixed_time, stages)
+        stage_breakdown(adapt_preds, labels, stages)
+
+        both = (fixed_areas > 0) & (adapt_areas > 0)
+        if both.any():
+            rel = np.abs(adapt_areas[both] - fixed_areas[both]) / fixed_areas[both]
+            print(f"{'':22s} | area deviation vs fixed (both detected): mean={rel.mean():.1%}")
+
+if __name__ == "__main__":
+    main()
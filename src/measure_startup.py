@@ -0,0 +1,75 @@
+# src/measure_startup.py
+# Cold-start timing for the Streamlit entry point and the pipeline CLI.
+# Run from the repo root on two checkouts to compare before/after:
+#   python src/measure_startup.py --repeats 5
+# The pipeline script is never imported: older checkouts run the whole
+# pipeline at import time, so only its top-level import statements are timed.
+import argparse
+import ast
+import statistics
+import subprocess
+import sys
+import time
+
+# Each probe runs in a fresh interpreter so nothing is already imported
+PROBES = {
+    "app: official dashboard import": "import ui.official_dashboard",
+    "app: resident dashboard import": "import ui.resident_dashboard",
+}
+
+PIPELINE_SCRIPT = "src/run_pipeline.py"
+
+MODEL_PROBE = (
+    "import sys, time; sys.path.insert(0, 'src')\n"
+    "from model_registry import get_model\n"
+    "t = time.perf_counter(); get_model(); cold = time.perf_counter() - t\n"
+    "t = time.perf_counter(); get_model(); warm = time.perf_counter() - t\n"
+    "print(f'{cold:.4f} {warm:.4f}')"
+)
+
+def time_probe(code, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def module_imports(path):
+    # The script's top-level import statements, without the rest of its body
+    with open(path) as f:
+        tree = ast.parse(f.read())
+    lines = [ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    return "import sys; sys.path.insert(0, 'src')\n" + "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--skip-model", action="store_true")
+    args = parser.parse_args()
+
+    baseline = time_probe("pass", args.repeats)
+    print(f"{'interpreter only':40s} {baseline:.3f}s")
+    probes = dict(PROBES)
+    probes["pipeline: module imports"] = module_imports(PIPELINE_SCRIPT)
+    for name, code in probes.items():
+        try:
+            elapsed = time_probe(code, args.repeats)
+            print(f"{name:40s} {elapsed:.3f}s")
+        except subprocess.CalledProcessError:
+            print(f"{name:40s} failed")
+
+    if not args.skip_model:
+        try:
+            out = subprocess.run([sys.executable, "-c", MODEL_PROBE],
+                                 check=True, capture_output=True, text=True).stdout
+        except subprocess.CalledProcessError:
+            print(f"{'model load':40s} failed")
+            return
+        cold, warm = map(float, out.split()[-2:])
+        print(f"{'model load (cold)':40s} {cold:.3f}s")
+        print(f"{'model load (registry hit)':40s} {warm:.3f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# src/model_registry.py
+import hashlib
+import os
+import threading
+
+# best.pt by default; point this at an exported backend (.onnx, .engine,
+# *_openvino_model/, .torchscript) to serve that instead
+MODEL_PATH = os.getenv("YOLO_MODEL_PATH", "models/yolo/best.pt")
+
+_models = {}
+_hashes = {}
+_lock = threading.Lock()
+
+def _iter_weight_files(path):
+    # Exported backends such as OpenVINO are directories of files
+    if os.path.isdir(path):
+        for root, _, files in sorted(os.walk(path)):
+            for name in sorted(files):
+                yield os.path.join(root, name)
+    else:
+        yield path
+
+def weights_hash(path):
+    # Re-hash only when the weights on disk change
+    stat = os.stat(path)
+    stamp = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    if stamp in _hashes:
+        return _hashes[stamp]
+
+    h = hashlib.sha256()
+    for file_path in _iter_weight_files(path):
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    digest = h.hexdigest()
+    _hashes[stamp] = digest
+    return digest
+
+class SerializedModel:
+    # Ultralytics predictors are not thread-safe; Streamlit sessions share
+    # this instance, so each call runs under the model's own lock
+    def __init__(self, model):
+        self.model = model
+        self.lock = threading.Lock()
+
+    def __call__(self, *args, **kwargs):
+        with self.lock:
+            return self.model(*args, **kwargs)
+
+    def predict(self, *args, **kwargs):
+        with self.lock:
+            return self.model.predict(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
+
+def get_model(path=MODEL_PATH):
+    # One YOLO instance per distinct set of weights for the whole process
+    key = weights_hash(path)
+    with _lock:
+        model = _models.get(key)
+        if model is None:
+            from ultralytics import YOLO
+            model = SerializedModel(YOLO(path, task="detect"))
+            _models[key] = model
+    return model
+
+def clear_models():
+    with _lock:
+        _models.clear()
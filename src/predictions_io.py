@@ -0,0 +1,110 @@
+# src/predictions_io.py
+# Streaming prediction format: one JSON object per line (JSON Lines).
+# While detection runs a "<file>.running" marker exists; "<file>.done" is
+# written only when it finishes cleanly, so followers know when to stop
+# and never mistake a crashed or previous run for a complete one.
+import json
+import os
+import time
+
+PRED_PATH = "outputs/predictions/predictions.jsonl"
+LEGACY_PRED_PATH = "outputs/predictions/predictions.json"
+
+def done_marker(path):
+    return path + ".done"
+
+def running_marker(path):
+    return path + ".running"
+
+def _remove(path):
+    if os.path.exists(path):
+        os.remove(path)
+
+class PredictionWriter:
+    def __init__(self, path=PRED_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Retire the previous run before announcing this one
+        _remove(done_marker(path))
+        self._f = open(path, "w", encoding="utf-8")
+        open(running_marker(path), "w").close()
+
+    def write(self, record):
+        self._f.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def write_batch(self, records):
+        for record in records:
+            self.write(record)
+        # Make the batch visible to readers following the file
+        self._f.flush()
+        os.fsync(self._f.fileno())
+
+    def close(self, complete=True):
+        if self._f.closed:
+            return
+        self._f.close()
+        if complete:
+            open(done_marker(self.path), "w").close()
+        _remove(running_marker(self.path))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(complete=exc_type is None)
+
+def iter_predictions(path=PRED_PATH, follow=False, poll_interval=0.5):
+    # Yield one prediction dict at a time. With follow=True, keep reading
+    # while the writer is still running, until its done marker appears.
+    if path == PRED_PATH and not follow and not os.path.exists(path) and os.path.exists(LEGACY_PRED_PATH):
+        # Older runs wrote a single JSON array
+        with open(LEGACY_PRED_PATH) as f:
+            yield from json.load(f)
+        return
+
+    # A follower waits for a run that is in progress or finished after it
+    # started; an older complete file is not the run it was started for
+    started = time.time()
+    def current_run():
+        if os.path.exists(running_marker(path)):
+            return True
+        done = done_marker(path)
+        return os.path.exists(done) and os.stat(done).st_mtime >= started
+
+    while follow and not current_run():
+        time.sleep(poll_interval)
+
+    if not follow:
+        if os.path.exists(running_marker(path)):
+            print(f"[WARNING] {path} is still being written; reading the predictions finished so far")
+        elif not os.path.exists(done_marker(path)):
+            print(f"[WARNING] {path} is from a run that did not finish; predictions may be missing")
+
+    with open(path, encoding="utf-8") as f:
+        pending = ""
+        while True:
+            line = f.readline()
+            if line:
+                pending += line
+                # A line without "\n" is still being written
+                if not pending.endswith("\n"):
+                    continue
+                if pending.strip():
+                    yield json.loads(pending)
+                pending = ""
+                continue
+
+            finished = os.path.exists(done_marker(path))
+            if not follow or finished or not os.path.exists(running_marker(path)):
+                # Drain anything written between the last read and the marker;
+                # only lines the writer terminated are complete records
+                *complete, partial = (pending + f.read()).split("\n")
+                for tail in complete:
+                    if tail.strip():
+                        yield json.loads(tail)
+                if partial.strip():
+                    print(f"[WARNING] Skipping incomplete last line of {path}")
+                if follow and not finished and not os.path.exists(done_marker(path)):
+                    raise RuntimeError(f"Detection stopped before finishing {path}")
+                return
+            time.sleep(poll_interval)
@@ -1,22 +1,24 @@
-import json, os, pandas as pd
+import csv, os, sys
+
+from predictions_io import PRED_PATH, iter_predictions
 
-PRED_JSON = "outputs/predictions/predictions.json"
 OUT_CSV = "outputs/metrics/area_summary.csv"
 os.makedirs("outputs/metrics", exist_ok=True)
 
+# --follow: start while detect_yolo.py is still writing
+FOLLOW = "--follow" in sys.argv
+
 def box_area(xyxy):
     x1,y1,x2,y2 = xyxy
     return (x2-x1) * (y2-y1)
 
-with open(PRED_JSON) as f:
-    preds = json.load(f)
-
-rows = []
-for p in preds:
-    total_area = sum(box_area(b["xyxy"]) for b in p["boxes"])
-    max_conf = max((b["conf"] for b in p["boxes"]), default=0)
-    rows.append({"image": p["image"], "num_boxes": len(p["boxes"]),
-                 "total_area_pixels": total_area, "max_conf": max_conf})
+with open(OUT_CSV, "w", newline="") as f:
+    writer = csv.DictWriter(f, fieldnames=["image", "num_boxes", "total_area_pixels", "max_conf"])
+    writer.writeheader()
+    for p in iter_predictions(PRED_PATH, follow=FOLLOW):
+        total_area = sum(box_area(b["xyxy"]) for b in p["boxes"])
+        max_conf = max((b["conf"] for b in p["boxes"]), default=0)
+        writer.writerow({"image": p["image"], "num_boxes": len(p["boxes"]),
+                         "total_area_pixels": total_area, "max_conf": max_conf})
 
-pd.DataFrame(rows).to_csv(OUT_CSV, index=False)
-print(f"Saved {OUT_CSV}")
\ No newline at end of file
+print(f"Saved {OUT_CSV}")
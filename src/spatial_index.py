@@ -0,0 +1,166 @@
+# src/spatial_index.py
+# Geohash index over verified results for the official map view.
+# Every sample is counted into one cell per geohash precision, so a
+# viewport query only touches the cells that cover it: coarse cells come
+# back as clusters, and individual markers are returned only once few
+# enough samples are in view. Cells cut by the viewport edge are clipped
+# so counts and centroids only include samples actually in view.
+import math
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+MAX_PRECISION = 8           # ~38 m x 19 m cells
+MAX_CELLS_ACROSS = 24       # cluster cells across the viewport width
+MARKER_LIMIT = 500          # switch from clusters to markers below this
+
+def geohash_encode(lat, lon, precision=MAX_PRECISION):
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, ch, even = [], 0, 0, True
+    while len(chars) < precision:
+        rng, val = (lon_range, lon) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        if val >= mid:
+            ch = (ch << 1) | 1
+            rng[0] = mid
+        else:
+            ch <<= 1
+            rng[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[ch])
+            bits, ch = 0, 0
+    return "".join(chars)
+
+def geohash_bounds(gh):
+    # (south, west, north, east) of a geohash cell
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for c in gh:
+        bits = BASE32.index(c)
+        for shift in range(4, -1, -1):
+            rng = lon_range if even else lat_range
+            mid = (rng[0] + rng[1]) / 2
+            if (bits >> shift) & 1:
+                rng[0] = mid
+            else:
+                rng[1] = mid
+            even = not even
+    return lat_range[0], lon_range[0], lat_range[1], lon_range[1]
+
+def cell_size(precision):
+    # (lat degrees, lon degrees) covered by one cell
+    lon_bits = math.ceil(5 * precision / 2)
+    lat_bits = 5 * precision // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+def viewport(center_lat, center_lon, zoom, width_px=900, height_px=500):
+    # Web-mercator bounding box (south, west, north, east) for a map view
+    lon_span = 360.0 / 2 ** zoom * width_px / 256
+    lat_span = lon_span * math.cos(math.radians(center_lat)) * height_px / width_px
+    return (max(-90.0, center_lat - lat_span / 2), center_lon - lon_span / 2,
+            min(90.0, center_lat + lat_span / 2), center_lon + lon_span / 2)
+
+def precision_for(west, east):
+    for precision in range(1, MAX_PRECISION + 1):
+        if (east - west) / cell_size(precision)[1] > MAX_CELLS_ACROSS:
+            return max(1, precision - 1)
+    return MAX_PRECISION
+
+def covering_cells(south, west, north, east, precision):
+    dlat, dlon = cell_size(precision)
+    cells = set()
+    lat = south
+    while lat < north + dlat:
+        lon = west
+        while lon < east + dlon:
+            cells.add(geohash_encode(min(lat, north), ((min(lon, east) + 180) % 360) - 180, precision))
+            lon += dlon
+        lat += dlat
+    return cells
+
+class GeohashIndex:
+    def __init__(self):
+        # precision -> {geohash: [count, sum_lat, sum_lon, verifiable]}
+        self.cells = {p: {} for p in range(1, MAX_PRECISION + 1)}
+        # precision -> {geohash: set of child geohashes}
+        self.children = {p: {} for p in range(1, MAX_PRECISION)}
+        # full-precision geohash -> list of sample records
+        self.leaves = {}
+
+    def __len__(self):
+        return sum(c[0] for c in self.cells[1].values())
+
+    def add(self, sample_id, lat, lon, qc_status, pv_area_sqm=0.0):
+        gh = geohash_encode(lat, lon)
+        verifiable = 1 if qc_status == "VERIFIABLE" else 0
+        for p in range(1, MAX_PRECISION + 1):
+            cell = self.cells[p].setdefault(gh[:p], [0, 0.0, 0.0, 0])
+            cell[0] += 1
+            cell[1] += lat
+            cell[2] += lon
+            cell[3] += verifiable
+            if p < MAX_PRECISION:
+                self.children[p].setdefault(gh[:p], set()).add(gh[:p + 1])
+        self.leaves.setdefault(gh, []).append({
+            "sample_id": sample_id, "lat": lat, "lon": lon,
+            "qc_status": qc_status, "pv_area_sqm": pv_area_sqm,
+        })
+
+    def _clipped(self, gh, south, west, north, east):
+        # [count, sum_lat, sum_lon, verifiable] of the cell's samples inside the box
+        s, w, n, e = geohash_bounds(gh)
+        if s > north or n < south or w > east or e < west:
+            return [0, 0.0, 0.0, 0]
+        if s >= south and n <= north and w >= west and e <= east:
+            return list(self.cells[len(gh)][gh])
+        total = [0, 0.0, 0.0, 0]
+        if len(gh) == MAX_PRECISION:
+            for r in self.leaves.get(gh, []):
+                if south <= r["lat"] <= north and west <= r["lon"] <= east:
+                    total[0] += 1
+                    total[1] += r["lat"]
+                    total[2] += r["lon"]
+                    total[3] += 1 if r["qc_status"] == "VERIFIABLE" else 0
+            return total
+        for child in self.children[len(gh)].get(gh, ()):
+            part = self._clipped(child, south, west, north, east)
+            total = [a + b for a, b in zip(total, part)]
+        return total
+
+    def _leaves_under(self, gh):
+        stack = [gh]
+        while stack:
+            h = stack.pop()
+            if len(h) == MAX_PRECISION:
+                yield from self.leaves.get(h, [])
+            else:
+                stack.extend(self.children[len(h)].get(h, ()))
+
+    def query(self, south, west, north, east):
+        # Returns ("clusters" | "markers", items) for the bounding box
+        precision = precision_for(west, east)
+        cells = {}
+        for h in covering_cells(south, west, north, east, precision):
+            if h in self.cells[precision]:
+                clipped = self._clipped(h, south, west, north, east)
+                if clipped[0]:
+                    cells[h] = clipped
+
+        if sum(c[0] for c in cells.values()) <= MARKER_LIMIT:
+            markers = [r for h in cells for r in self._leaves_under(h)
+                       if south <= r["lat"] <= north and west <= r["lon"] <= east]
+            return "markers", markers
+
+        clusters = []
+        for h, (count, sum_lat, sum_lon, verifiable) in cells.items():
+            clusters.append({"geohash": h, "lat": sum_lat / count, "lon": sum_lon / count,
+                             "count": count, "verifiable": verifiable})
+        return "clusters", clusters
+
+def build_index(samples):
+    # samples: the per-sample DataFrame from analytics.load_samples()
+    index = GeohashIndex()
+    rows = samples.dropna(subset=["lat", "lon"])
+    for r in rows[["sample_id", "lat", "lon", "qc_status", "pv_area_sqm"]].itertuples(index=False):
+        index.add(str(r.sample_id), float(r.lat), float(r.lon), r.qc_status, float(r.pv_area_sqm))
+    return index
@@ -0,0 +1,216 @@
+# src/sweep.py
+# Parallel hyperparameter sweep with successive halving.
+#   python src/sweep.py sweeps/yolo.yaml
+#   python src/sweep.py sweeps/classifier.yaml --workers 2
+#
+# Every trial starts at min_epochs; after each rung only the best 1/eta
+# keep training from their own weights until they reach eta times the
+# epochs, up to max_epochs. Trials in a rung run side by side in a process
+# pool, each worker pinned to its own slice of CPU cores. Each finished
+# trial is logged to MLflow straight away.
+import argparse
+import math
+import multiprocessing as mp
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import yaml
+
+SWEEP_ROOT = "runs/sweep"
+MLFLOW_URI = os.getenv("MLFLOW_TRACKING_URI", "runs/mlflow")
+
+# Keys in a saved args.yaml that describe a past run rather than a setting
+YOLO_RUN_KEYS = {"mode", "task", "model", "name", "project", "save_dir", "resume", "exist_ok"}
+
+def sample_params(space, rng):
+    params = {}
+    for key, spec in space.items():
+        if isinstance(spec, list):
+            params[key] = rng.choice(spec)
+        elif spec["type"] == "choice":
+            params[key] = rng.choice(spec["values"])
+        elif spec["type"] == "uniform":
+            params[key] = rng.uniform(spec["low"], spec["high"])
+        elif spec["type"] == "loguniform":
+            params[key] = math.exp(rng.uniform(math.log(spec["low"]), math.log(spec["high"])))
+        elif spec["type"] == "int":
+            params[key] = rng.randint(spec["low"], spec["high"])
+        else:
+            raise ValueError(f"Unknown search type for {key}: {spec['type']}")
+    return params
+
+def rung_budgets(min_epochs, max_epochs, eta):
+    # Cumulative epochs per rung: min_epochs * eta**k, capped at max_epochs
+    budgets = [min_epochs]
+    while budgets[-1] * eta <= max_epochs:
+        budgets.append(budgets[-1] * eta)
+    return budgets
+
+def cpu_slices(workers, threads_per_trial):
+    # Consecutive cores per worker, wrapping around if oversubscribed
+    cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(os.cpu_count() or 1))
+    return [sorted({cpus[(i * threads_per_trial + j) % len(cpus)] for j in range(threads_per_trial)})
+            for i in range(workers)]
+
+def _pin_worker(slot_queue):
+    # Runs once per pool process, before torch is imported
+    cores = slot_queue.get()
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[var] = str(len(cores))
+
+def run_trial(kind, trial_id, params, epochs, base, trial_dir, init_weights=None):
+    # Trains `epochs` more epochs, starting from init_weights (the trial's
+    # previous rung) when given; returns the weights the next rung continues from
+    import torch
+    torch.set_num_threads(int(os.environ.get("OMP_NUM_THREADS", "1")))
+
+    os.makedirs(trial_dir, exist_ok=True)
+    start = time.time()
+    if kind == "yolo":
+        from ultralytics import YOLO
+
+        model = YOLO(init_weights or base.get("model", "yolov8s.pt"))
+        overrides = {k: v for k, v in base.items() if k not in YOLO_RUN_KEYS}
+        overrides.update(params)
+        # Warmup ramps lr0 in from warmup_bias_lr: keep it to at most half of
+        # the first rung so trials are ranked on their swept lr0, and skip it
+        # when continuing from the previous rung's weights
+        warmup = float(overrides.get("warmup_epochs", 0.0))
+        overrides["warmup_epochs"] = 0.0 if init_weights else min(warmup, epochs / 2)
+        overrides.update(epochs=epochs, project=os.path.dirname(trial_dir),
+                         name=os.path.basename(trial_dir), exist_ok=True, workers=0, plots=False)
+        metrics = model.train(**overrides)
+        score = float(metrics.fitness)
+        weights = os.path.join(trial_dir, "weights", "last.pt")
+    else:
+        from train import fit
+
+        weights = os.path.join(trial_dir, "best_model.pt")
+        score = fit(**params, epochs=epochs, weights_path=weights, init_weights=init_weights,
+                    log_path=os.path.join(trial_dir, "train.txt"))
+    return trial_id, score, weights, time.time() - start
+
+def load_base(config):
+    if config["kind"] != "yolo":
+        return {}
+    with open(config.get("base", "runs/detect/train/args.yaml")) as f:
+        base = yaml.safe_load(f)
+    if config.get("model"):
+        base["model"] = config["model"]
+    return base
+
+def start_mlflow(sweep_name, config):
+    # Opens the parent run; returns None when mlflow is not installed
+    try:
+        import mlflow
+    except ImportError:
+        print("[WARNING] mlflow not installed, skipping experiment logging")
+        return None
+
+    mlflow.set_tracking_uri(MLFLOW_URI)
+    mlflow.set_experiment(f"sweep-{config['kind']}")
+    mlflow.start_run(run_name=sweep_name)
+    mlflow.log_params({k: v for k, v in config.items() if k != "space"})
+    return mlflow
+
+def log_trial(mlflow, r):
+    if mlflow is None:
+        return
+    with mlflow.start_run(run_name=f"trial_{r['trial_id']:03d}_e{r['epochs']}", nested=True):
+        mlflow.log_params(r["params"])
+        mlflow.log_param("epochs", r["epochs"])
+        mlflow.log_metric("score", r["score"], step=r["epochs"])
+        mlflow.log_metric("wall_time_s", r["seconds"])
+
+def run_sweep(config, workers=None, threads_per_trial=None):
+    kind = config["kind"]
+    eta = config.get("eta", 3)
+    n_trials = config.get("trials", 9)
+    budgets = rung_budgets(config.get("min_epochs", 1), config.get("max_epochs", 10), eta)
+    rng = random.Random(config.get("seed", 0))
+    base = load_base(config)
+
+    workers = workers or config.get("workers") or max(1, (os.cpu_count() or 1) // 2)
+    threads_per_trial = threads_per_trial or config.get("threads_per_trial") or max(1, (os.cpu_count() or 1) // workers)
+
+    sweep_name = f"{kind}_{int(time.time())}"
+    sweep_dir = os.path.join(SWEEP_ROOT, sweep_name)
+    os.makedirs(sweep_dir, exist_ok=True)
+
+    trials = {i: sample_params(config["space"], rng) for i in range(n_trials)}
+    survivors = list(trials)
+    weights = {}
+    results = []
+    mlflow = start_mlflow(sweep_name, config)
+
+    ctx = mp.get_context("spawn")
+    slot_queue = ctx.Queue()
+    for cores in cpu_slices(workers, threads_per_trial):
+        slot_queue.put(cores)
+
+    sweep_start = time.time()
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                                 initializer=_pin_worker, initargs=(slot_queue,)) as pool:
+            done_epochs = 0
+            for rung, epochs in enumerate(budgets):
+                print(f"[INFO] Rung {rung}: {len(survivors)} trials x {epochs} epochs")
+                futures = [
+                    pool.submit(run_trial, kind, i, trials[i], epochs - done_epochs, base,
+                                os.path.join(sweep_dir, f"trial_{i:03d}_e{epochs}"), weights.get(i))
+                    for i in survivors
+                ]
+                scores = {}
+                for future in as_completed(futures):
+                    try:
+                        trial_id, score, weights[trial_id], seconds = future.result()
+                    except Exception as e:
+                        print(f"[ERROR] Trial failed: {e}")
+                        continue
+                    scores[trial_id] = score
+                    result = {"trial_id": trial_id, "epochs": epochs, "score": score,
+                              "seconds": round(seconds, 1), "params": trials[trial_id]}
+                    results.append(result)
+                    log_trial(mlflow, result)
+                    print(f"[INFO] Trial {trial_id:03d} ({epochs} epochs): score={score:.4f}, {seconds:.0f}s")
+
+                if not scores:
+                    print("[FATAL] Every trial in this rung failed")
+                    break
+                ranked = sorted(scores, key=scores.get, reverse=True)
+                survivors = ranked[:max(1, len(ranked) // eta)]
+                done_epochs = epochs
+
+        if not results:
+            return None
+        best = max(results, key=lambda r: (r["epochs"], r["score"]))
+        if mlflow is not None:
+            mlflow.log_metric("best_score", best["score"])
+    finally:
+        if mlflow is not None:
+            mlflow.end_run()
+
+    print(f"[INFO] Sweep finished in {time.time() - sweep_start:.0f}s")
+    print(f"[INFO] Best trial {best['trial_id']:03d}: score={best['score']:.4f}, params={best['params']}")
+
+    with open(os.path.join(sweep_dir, "results.yaml"), "w") as f:
+        yaml.safe_dump({"best": best, "trials": results}, f, sort_keys=False)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("config", help="sweep YAML (see sweeps/)")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--threads-per-trial", type=int)
+    args = parser.parse_args()
+
+    with open(args.config) as f:
+        config = yaml.safe_load(f)
+    run_sweep(config, args.workers, args.threads_per_trial)
+
+if __name__ == "__main__":
+    main()
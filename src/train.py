@@ -63,28 +63,33 @@ def evaluate(model, loader, criterion, device):
 
     return (running_loss / len(loader.dataset)), acc, f1
 
-def main():
+def fit(lr=1e-4, batch_size=32, epochs=10, image_size=512,
+        weights_path=os.path.join("trained_model", "best_model.pt"), log_path=None, init_weights=None):
     set_seed(42)
     device = get_device()
-    os.makedirs("trained_model", exist_ok=True)
+    os.makedirs(os.path.dirname(weights_path) or ".", exist_ok=True)
     os.makedirs("logs", exist_ok=True)
 
     # Datasets and loaders
-    train_ds = SolarDataset(csv_path="data/train_split.csv", augment=True)
-    val_ds = SolarDataset(csv_path="data/val_split.csv", augment=False)
+    train_ds = SolarDataset(csv_path="data/train_split.csv", image_size=image_size, augment=True)
+    val_ds = SolarDataset(csv_path="data/val_split.csv", image_size=image_size, augment=False)
 
-    train_loader = DataLoader(train_ds, batch_size=32, shuffle=True, num_workers=0)
-    val_loader = DataLoader(val_ds, batch_size=32, shuffle=False, num_workers=0)
+    train_loader = DataLoader(train_ds, batch_size=batch_size, shuffle=True, num_workers=0)
+    val_loader = DataLoader(val_ds, batch_size=batch_size, shuffle=False, num_workers=0)
 
     # Model, loss, optimizer
     model = build_model(num_classes=2).to(device)
+    if init_weights:
+        # Continue from an earlier run (e.g. the previous sweep rung)
+        model.load_state_dict(torch.load(init_weights, map_location=device))
     criterion = nn.CrossEntropyLoss()
-    optimizer = optim.Adam(model.parameters(), lr=1e-4)
+    optimizer = optim.Adam(model.parameters(), lr=lr)
 
     best_f1 = -1.0
-    log_path = os.path.join("logs", f"train_{int(time.time())}.txt")
+    if log_path is None:
+        log_path = os.path.join("logs", f"train_{int(time.time())}.txt")
     with open(log_path, "w") as logf:
-        for epoch in range(1, 11):  # 10 epochs baseline
+        for epoch in range(1, epochs + 1):
             train_loss = train_one_epoch(model, train_loader, criterion, optimizer, device)
             val_loss, val_acc, val_f1 = evaluate(model, val_loader, criterion, device)
 
@@ -94,8 +99,12 @@ def main():
 
             if val_f1 > best_f1:
                 best_f1 = val_f1
-                torch.save(model.state_dict(), os.path.join("trained_model", "best_model.pt"))
+                torch.save(model.state_dict(), weights_path)
+
+    return best_f1
 
+def main():
+    best_f1 = fit(epochs=10)  # 10 epochs baseline
     print(f"Best val F1: {best_f1:.4f}")
     print("Training complete. Model saved to trained_model/best_model.pt")
 
@@ -0,0 +1,54 @@
+import json
+import os
+import shutil
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+import analytics
+
+MANIFESTS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "outputs", "manifests")
+COLS = analytics.MEASURES + ["samples", "with_solar"]
+
+
+def _paths(tmp_path):
+    return str(tmp_path / "m"), str(tmp_path / "samples.csv"), str(tmp_path / "rollups.csv")
+
+
+def _sorted(df):
+    return df.sort_values(analytics.KEYS).reset_index(drop=True)[analytics.KEYS + COLS]
+
+
+def test_incremental_rollups_match_full_rebuild(tmp_path):
+    manifest_dir, samples_path, rollup_path = _paths(tmp_path)
+    shutil.copytree(MANIFESTS, manifest_dir)
+    analytics.update_rollups(manifest_dir, samples_path, rollup_path)
+
+    # One new sample and one re-processed sample
+    with open(os.path.join(manifest_dir, "BLR_002.json")) as f:
+        m = json.load(f)
+    m.update(sample_id="BLR_009", pv_area_sqm_est=50.0, has_solar=True, qc_status="VERIFIABLE")
+    with open(os.path.join(manifest_dir, "BLR_009.json"), "w") as f:
+        json.dump(m, f)
+    m.update(sample_id="BLR_002", pv_area_sqm_est=20.0)
+    with open(os.path.join(manifest_dir, "BLR_002.json"), "w") as f:
+        json.dump(m, f)
+    os.utime(os.path.join(manifest_dir, "BLR_002.json"), ns=(1, 1))
+
+    folded = analytics.update_rollups(manifest_dir, samples_path, rollup_path)
+    rebuilt = analytics.build_rollups(analytics.load_samples(samples_path))
+
+    assert len(analytics.load_samples(samples_path)) == 11
+    pd.testing.assert_frame_equal(_sorted(folded), _sorted(rebuilt), check_dtype=False)
+    blr = analytics.summarize(folded, "region").set_index("region").loc["BLR"]
+    assert blr["samples"] == 2 and blr["pv_area_sqm"] == pytest.approx(70.0)
+
+
+def test_unchanged_manifests_are_not_reparsed(tmp_path):
+    manifest_dir, samples_path, rollup_path = _paths(tmp_path)
+    shutil.copytree(MANIFESTS, manifest_dir)
+    analytics.update_rollups(manifest_dir, samples_path, rollup_path)
+
+    _, added, removed = analytics.update_samples(manifest_dir, samples_path)
+    assert added.empty and removed.empty
@@ -0,0 +1,48 @@
+import os
+
+import certificates
+
+
+def _setup(tmp_path, monkeypatch):
+    template = tmp_path / "cert_temp.txt"
+    template.write_text("Certificate for {sample_id}: {total_area} sqm")
+    metrics = tmp_path / "pipeline_metrics.csv"
+    metrics.write_text("sample_id,panel_count,total_area,qc_flag,solar_health_score\n"
+                       "BLR_001,4,20.0,Pass,High\n"
+                       "BLR_002,0,0.0,Fail,Low\n")
+
+    calls = []
+    load_record = certificates.load_record
+    def counting(sample_id):
+        calls.append(sample_id)
+        return load_record(sample_id, str(metrics), str(tmp_path))
+    monkeypatch.setattr(certificates, "load_record", counting)
+    return str(template), str(tmp_path / "certs"), calls
+
+
+def test_cached_certificate_skips_record_lookup(tmp_path, monkeypatch):
+    template, cert_dir, calls = _setup(tmp_path, monkeypatch)
+
+    first = certificates.get_certificate("BLR_001", cert_dir=cert_dir, template_path=template)
+    second = certificates.get_certificate("BLR_001", cert_dir=cert_dir, template_path=template)
+    assert first == second == b"Certificate for BLR_001: 20.0 sqm"
+    assert calls == ["BLR_001"]
+
+
+def test_template_edit_invalidates_cached_certificate(tmp_path, monkeypatch):
+    template, cert_dir, _ = _setup(tmp_path, monkeypatch)
+    certificates.get_certificate("BLR_001", cert_dir=cert_dir, template_path=template)
+
+    with open(template, "w") as f:
+        f.write("Revised certificate for {sample_id}")
+    cached = certificates.certificate_path("BLR_001", cert_dir=cert_dir)
+    os.utime(cached, ns=(1, 1))
+    assert certificates.get_certificate("BLR_001", cert_dir=cert_dir, template_path=template) == \
+        b"Revised certificate for BLR_001"
+
+
+def test_rejects_ineligible_and_unsafe_ids(tmp_path, monkeypatch):
+    template, cert_dir, calls = _setup(tmp_path, monkeypatch)
+    assert certificates.get_certificate("BLR_002", cert_dir=cert_dir, template_path=template) is None
+    assert certificates.get_certificate("../cert_temp", cert_dir=cert_dir, template_path=template) is None
+    assert calls == ["BLR_002"]
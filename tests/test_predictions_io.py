@@ -0,0 +1,87 @@
+import os
+import threading
+import time
+
+import pytest
+
+from predictions_io import PredictionWriter, done_marker, iter_predictions, running_marker
+
+
+def _follow_in_thread(path, out):
+    def run():
+        try:
+            out.extend(iter_predictions(path, follow=True, poll_interval=0.01))
+        except RuntimeError as e:
+            out.append(e)
+    t = threading.Thread(target=run)
+    t.start()
+    return t
+
+
+def test_roundtrip(tmp_path):
+    path = str(tmp_path / "p.jsonl")
+    with PredictionWriter(path) as writer:
+        writer.write_batch([{"image": "a.jpg", "boxes": []}, {"image": "b.jpg", "boxes": []}])
+    assert [p["image"] for p in iter_predictions(path)] == ["a.jpg", "b.jpg"]
+    assert os.path.exists(done_marker(path))
+    assert not os.path.exists(running_marker(path))
+
+
+def test_follower_started_before_writer_skips_previous_run(tmp_path):
+    path = str(tmp_path / "p.jsonl")
+    with PredictionWriter(path) as writer:
+        writer.write_batch([{"stale": True}])
+
+    out = []
+    follower = _follow_in_thread(path, out)
+    time.sleep(0.1)
+    assert follower.is_alive()
+
+    with PredictionWriter(path) as writer:
+        for i in range(3):
+            writer.write_batch([{"image": f"{i}.jpg", "boxes": []}])
+            time.sleep(0.05)
+    follower.join(timeout=5)
+
+    assert not follower.is_alive()
+    assert [p["image"] for p in out] == ["0.jpg", "1.jpg", "2.jpg"]
+
+
+def test_failed_run_is_not_marked_done(tmp_path):
+    path = str(tmp_path / "p.jsonl")
+    out = []
+    follower = _follow_in_thread(path, out)
+
+    with pytest.raises(ValueError):
+        with PredictionWriter(path) as writer:
+            writer.write_batch([{"image": "a.jpg", "boxes": []}])
+            time.sleep(0.05)
+            raise ValueError("detector crashed")
+    follower.join(timeout=5)
+
+    assert not os.path.exists(done_marker(path))
+    assert not os.path.exists(running_marker(path))
+    assert out[0]["image"] == "a.jpg"
+    assert isinstance(out[-1], RuntimeError)
+
+
+def test_reading_during_a_run_skips_the_partial_line(tmp_path, capsys):
+    path = str(tmp_path / "p.jsonl")
+    writer = PredictionWriter(path)
+    writer.write_batch([{"image": "a.jpg", "boxes": []}])
+    writer._f.write('{"image": "b.jp')
+    writer._f.flush()
+
+    assert [p["image"] for p in iter_predictions(path)] == ["a.jpg"]
+    assert "still being written" in capsys.readouterr().out
+    writer.close()
+
+
+def test_reading_a_crashed_run_warns(tmp_path, capsys):
+    path = str(tmp_path / "p.jsonl")
+    writer = PredictionWriter(path)
+    writer.write_batch([{"image": "a.jpg", "boxes": []}])
+    writer.close(complete=False)
+
+    assert [p["image"] for p in iter_predictions(path)] == ["a.jpg"]
+    assert "did not finish" in capsys.readouterr().out
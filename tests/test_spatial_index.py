@@ -0,0 +1,34 @@
+import random
+
+import spatial_index
+
+
+def _index(n=5000, seed=0):
+    rnd = random.Random(seed)
+    index, points = spatial_index.GeohashIndex(), []
+    for i in range(n):
+        lat, lon = rnd.uniform(12.0, 14.0), rnd.uniform(77.0, 78.5)
+        qc = rnd.choice(["VERIFIABLE", "NOT_VERIFIABLE"])
+        index.add(f"S{i}", lat, lon, qc)
+        points.append((lat, lon, qc))
+    return index, points
+
+
+def test_geohash_bounds_contain_encoded_point():
+    gh = spatial_index.geohash_encode(12.9352, 77.6146)
+    south, west, north, east = spatial_index.geohash_bounds(gh)
+    assert south <= 12.9352 <= north and west <= 77.6146 <= east
+
+
+def test_query_counts_only_samples_in_view():
+    index, points = _index()
+    for zoom in (8, 9, 10, 11, 13):
+        box = spatial_index.viewport(12.97, 77.59, zoom)
+        south, west, north, east = box
+        inside = [p for p in points if south <= p[0] <= north and west <= p[1] <= east]
+
+        kind, items = index.query(*box)
+        assert sum(i.get("count", 1) for i in items) == len(inside)
+        assert all(south <= i["lat"] <= north and west <= i["lon"] <= east for i in items)
+        if kind == "clusters":
+            assert sum(i["verifiable"] for i in items) == sum(p[2] == "VERIFIABLE" for p in inside)
@@ -1,8 +1,141 @@
 import streamlit as st
-import pandas as pd
 import json
 import os
-import subprocess
+import sys
+
+# The pipeline runs in-process so the YOLO model registry stays warm across runs
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+@st.cache_data
+def _load_rollups(path, mtime_ns):
+    import pandas as pd
+    return pd.read_csv(path, dtype={"date": str})
+
+def show_district_analytics():
+    import analytics
+
+    # Precomputed by the pipeline; only falls back to a refresh if missing
+    if not os.path.exists(analytics.ROLLUP_PATH):
+        analytics.update_rollups()
+    if not os.path.exists(analytics.ROLLUP_PATH):
+        st.info("No results yet. Run the pipeline to populate district analytics.")
+        return
+    rollups = _load_rollups(analytics.ROLLUP_PATH, os.stat(analytics.ROLLUP_PATH).st_mtime_ns)
+    if rollups.empty:
+        st.info("No results yet. Run the pipeline to populate district analytics.")
+        return
+
+    regions = sorted(rollups["region"].unique())
+    selected = st.multiselect("Regions", regions, default=regions)
+    view = rollups[rollups["region"].isin(selected)]
+
+    # Headline figures count only verified rooftops with solar
+    verified = view[(view["qc_status"] == "VERIFIABLE") & (view["with_solar"] > 0)]
+    totals = verified[analytics.MEASURES + ["with_solar"]].sum()
+    cols = st.columns(6)
+    cols[0].metric("Rooftops Checked", f"{int(view['samples'].sum()):,}")
+    cols[1].metric("Verified with Solar", f"{int(totals['with_solar']):,}")
+    cols[2].metric("PV Area", f"{totals['pv_area_sqm']:,.0f} sqm")
+    cols[3].metric("Capacity", f"{totals['system_kw']:,.1f} kW")
+    cols[4].metric("Savings", f"₹{totals['savings_inr_month']:,.0f}/mo")
+    cols[5].metric("CO₂ Avoided", f"{totals['co2_tons_month']:,.1f} t/mo")
+    st.caption("Area, capacity, savings and CO₂ cover verified rooftops only.")
+
+    by = st.radio("Group by", ["region", "qc_status", "date"], horizontal=True)
+    include_all = st.checkbox("Include rooftops that are not verified", value=(by == "qc_status"))
+    summary = analytics.summarize(view if include_all else verified, by)
+    st.dataframe(summary, hide_index=True)
+    st.bar_chart(summary.set_index(by)["system_kw"])
+
+@st.cache_resource(max_entries=1)
+def _load_spatial_index(path, mtime_ns):
+    import analytics
+    from spatial_index import build_index
+    return build_index(analytics.load_samples(path))
+
+def show_map_view():
+    import pydeck as pdk
+    import analytics
+    import spatial_index
+
+    if not os.path.exists(analytics.SAMPLES_PATH):
+        st.info("No results yet. Run the pipeline to populate the map.")
+        return
+    index = _load_spatial_index(analytics.SAMPLES_PATH, os.stat(analytics.SAMPLES_PATH).st_mtime_ns)
+    if not len(index):
+        st.info("No geolocated results yet.")
+        return
+
+    # Viewport lives in session state; only what falls inside it is served
+    if "map_view" not in st.session_state:
+        count, sum_lat, sum_lon, _ = max(index.cells[1].values())
+        st.session_state.map_view = {"lat": sum_lat / count, "lon": sum_lon / count, "zoom": 5}
+    view = st.session_state.map_view
+
+    # Pan by a quarter of the visible area
+    south, west, north, east = spatial_index.viewport(view["lat"], view["lon"], view["zoom"])
+    cols = st.columns(6)
+    if cols[0].button("⬅️ West"):
+        view["lon"] -= (east - west) / 4
+    if cols[1].button("➡️ East"):
+        view["lon"] += (east - west) / 4
+    if cols[2].button("⬆️ North"):
+        view["lat"] = min(85.0, view["lat"] + (north - south) / 4)
+    if cols[3].button("⬇️ South"):
+        view["lat"] = max(-85.0, view["lat"] - (north - south) / 4)
+    if cols[4].button("➕ Zoom in"):
+        view["zoom"] = min(18, view["zoom"] + 1)
+    if cols[5].button("➖ Zoom out"):
+        view["zoom"] = max(2, view["zoom"] - 1)
+
+    south, west, north, east = spatial_index.viewport(view["lat"], view["lon"], view["zoom"])
+    kind, items = index.query(south, west, north, east)
+
+    if kind == "clusters":
+        st.caption(f"{len(items)} clusters, {sum(c['count'] for c in items):,} rooftops in view")
+        cell_m = spatial_index.cell_size(len(items[0]["geohash"]))[1] * 111_000 if items else 0
+        largest = max((c["count"] for c in items), default=1)
+        items = [dict(c,
+                      radius=cell_m / 2 * (c["count"] / largest) ** 0.5,
+                      color=[int(220 * (1 - c["verifiable"] / c["count"])), int(160 * c["verifiable"] / c["count"]), 60, 170])
+                 for c in items]
+        layer = pdk.Layer(
+            "ScatterplotLayer", items, get_position="[lon, lat]", get_radius="radius",
+            get_fill_color="color", radius_min_pixels=6, pickable=True,
+        )
+        tooltip = {"text": "{count} rooftops\n{verifiable} verifiable"}
+    else:
+        st.caption(f"{len(items)} rooftops in view")
+        items = [dict(r, color=[30, 160, 60, 200] if r["qc_status"] == "VERIFIABLE" else [220, 60, 60, 200])
+                 for r in items]
+        layer = pdk.Layer(
+            "ScatterplotLayer", items, get_position="[lon, lat]", get_fill_color="color",
+            get_radius=15, radius_min_pixels=5, pickable=True,
+        )
+        tooltip = {"text": "{sample_id}\n{qc_status}\n{pv_area_sqm} sqm"}
+
+    st.pydeck_chart(pdk.Deck(
+        layers=[layer],
+        initial_view_state=pdk.ViewState(latitude=view["lat"], longitude=view["lon"], zoom=view["zoom"]),
+        tooltip=tooltip,
+    ))
+
+def _certificate_stamp():
+    import certificates
+    paths = [certificates.METRICS_PATH, certificates.MANIFEST_DIR, certificates.TEMPLATE_PATH]
+    return tuple(os.stat(p).st_mtime_ns if os.path.exists(p) else 0 for p in paths)
+
+@st.cache_data(max_entries=1)
+def _certificate_records(stamp):
+    import certificates
+    return certificates.load_records()
+
+@st.cache_data(max_entries=2)
+def _certificate_zip(fmt, sample_ids, stamp):
+    import certificates
+    return certificates.export_zip(sample_ids, fmt=fmt, records=_certificate_records(stamp))
 
 def show_official_dashboard():
     st.markdown("## Official Dashboard")
@@ -21,14 +154,28 @@ def show_official_dashboard():
             with open(input_path, "wb") as f:
                 f.write(uploaded_file.read())
 
+            from run_pipeline import main as run_pipeline
+
             try:
-                subprocess.run(["python", "src/run_pipeline.py"], check=True)
+                with st.spinner("Running pipeline..."):
+                    exit_code = run_pipeline(input_path)
+            except Exception as e:
+                print(f"[ERROR] Pipeline crashed: {e}")
+                exit_code = 1
+
+            if exit_code == 0:
                 st.success("Pipeline executed successfully!")
                 st.session_state.pipeline_ran = True
-            except subprocess.CalledProcessError:
+            else:
                 st.error("Pipeline execution failed. Please check the logs.")
                 st.session_state.pipeline_ran = False
 
+    with st.expander("District Analytics", expanded=True):
+        show_district_analytics()
+
+    with st.expander("Map View"):
+        show_map_view()
+
     # Only show results if pipeline has run
     if st.session_state.pipeline_ran:
         valid_ids = []
@@ -74,24 +221,40 @@ def show_official_dashboard():
                 st.warning("Manifest directory or ID list not found.")
 
         with tabs[2]:
-            cert_dir = "certificates"
-            if os.path.exists(cert_dir) and valid_ids:
-                expected_files = [f"{id}_certificate.txt" for id in valid_ids]
-                certs = [f for f in os.listdir(cert_dir) if f in expected_files]
-                if certs:
-                    for cert in certs:
-                        with st.expander(cert):
-                            with open(os.path.join(cert_dir, cert)) as f:
-                                cert_text = f.read()
-                            st.text(cert_text)
-                else:
-                    st.warning("No certificate files found for this upload.")
+            import certificates
+
+            stamp = _certificate_stamp()
+            records = _certificate_records(stamp)
+            records = {k: v for k, v in records.items() if k in valid_ids}
+            if certificates.load_template() is None:
+                st.warning("Certificate template not found. Certificates cannot be issued.")
+            elif records:
+                formats = ["txt", "pdf"] if certificates.pdf_available() else ["txt"]
+                fmt = st.radio("Certificate format", formats, horizontal=True)
+
+                # Built only when asked for, then cached until the results change
+                request = (fmt, tuple(sorted(records)), stamp)
+                if st.button(f"📦 Prepare ZIP of {len(records)} certificates"):
+                    st.session_state.cert_zip_request = request
+                if st.session_state.get("cert_zip_request") == request:
+                    st.download_button(
+                        label="Download certificates (ZIP)",
+                        data=_certificate_zip(*request),
+                        file_name=f"certificates_{fmt}.zip",
+                        mime="application/zip"
+                    )
+
+                previews = certificates.render_text(records.values())
+                for sample_id, cert_text in previews.items():
+                    with st.expander(f"{sample_id}_certificate.txt"):
+                        st.text(cert_text)
             else:
-                st.warning("Certificate directory or ID list not found.")
-                
+                st.warning("No eligible certificates found for this upload.")
+
         with tabs[3]:
             metrics_path = "outputs/metrics/pipeline_metrics.csv"
             if os.path.exists(metrics_path) and valid_ids:
+                import pandas as pd
                 df = pd.read_csv(metrics_path)
                 df_filtered = df[df["sample_id"].astype(str).isin(valid_ids)]
                 if not df_filtered.empty:
@@ -1,8 +1,11 @@
 import streamlit as st
-import pandas as pd
 import json
 import os
-import matplotlib.pyplot as plt
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
 
 def show_resident_dashboard():
     st.markdown("## Resident Dashboard")
@@ -94,18 +97,27 @@ def show_resident_dashboard():
         cert_id = st.text_input("Enter your Sample ID to retrieve your certificate")
 
         if cert_id:
-            cert_path = f"certificates/{cert_id}_certificate.txt"
-            if os.path.exists(cert_path):
-                with open(cert_path, "r", encoding="utf-8") as f:
-                    cert_text = f.read()
-
+            import certificates
+
+            # Rendered on first request, then served from the cached file
+            template_ready = certificates.load_template() is not None
+            cert_data = certificates.get_certificate(cert_id) if template_ready else None
+            if not template_ready:
+                st.warning("Certificates are temporarily unavailable. Please try again later.")
+            elif cert_data is not None:
+                cert_text = cert_data.decode("utf-8")
                 st.text_area("Preview", cert_text, height=300)
 
+                fmt = "txt"
+                if certificates.pdf_available():
+                    fmt = st.radio("Format", ["txt", "pdf"], horizontal=True)
+                data = cert_data if fmt == "txt" else certificates.get_certificate(cert_id, fmt="pdf")
+
                 st.download_button(
                     label="📄 Download Certificate",
-                    data=cert_text,
-                    file_name=f"{cert_id}_certificate.txt",
-                    mime="text/plain"
+                    data=data,
+                    file_name=f"{cert_id}_certificate.{fmt}",
+                    mime=certificates.MIME_TYPES[fmt]
                 )
             else:
                 st.warning("Certificate not found. It may not have been issued yet.")
@@ -130,13 +142,15 @@ def show_resident_dashboard():
                         st.warning("This house hasn't been certified by an official yet. Please wait for verification.")
                     else:
                         # Auto-calculate system size from rooftop area
-                        system_size = round(pv_area / 10, 1)  # assume ~10 sqm per kW
+                        import analytics
+
+                        system_size = round(pv_area / analytics.SQM_PER_KW, 1)
                         st.info(f"Detected System Size: {system_size} kW (based on rooftop area)")
 
-                        # Assumptions
-                        cost_per_kWh = 8  # ₹ per kWh
-                        generation_per_kW = 120  # kWh/month per kW system
-                        co2_per_kWh = 0.82  # kg CO₂ avoided per kWh
+                        # Assumptions (shared with the district rollups)
+                        cost_per_kWh = analytics.COST_PER_KWH
+                        generation_per_kW = analytics.GENERATION_PER_KW
+                        co2_per_kWh = analytics.CO2_PER_KWH
                         cost_per_kW = 40000  # ₹ per kW installation cost
 
                         monthly_generation = system_size * generation_per_kW
@@ -150,6 +164,7 @@ def show_resident_dashboard():
                         st.success(f"CO₂ Reduction: {co2_reduction:.2f} tons per month")
 
                         # --- Visual Bar Chart ---
+                        import pandas as pd
                         chart_data = pd.DataFrame({
                             "Category": ["Monthly Usage", "Solar Generation"],
                             "kWh": [monthly_usage, monthly_generation]